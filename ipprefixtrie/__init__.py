@@ -19,3 +19,5 @@
 
 from .metadata import version as __version__  # noqa: F401
 from .ipprefixtrie import IPPrefixTrie  # noqa: F401
+from .intervaltable import IPIntervalTable  # noqa: F401
+from .profiler import IPPrefixTrieProfiler  # noqa: F401
@@ -36,3 +36,8 @@ class InvalidPrefixError(IPPrefixError):
 class PrefixNotFoundError(IPPrefixError):
     """Raised when a prefix lookup fails."""
     pass
+
+
+class VersionError(Error):
+    """Raised when a trie version can not be snapshotted or modified."""
+    pass
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of IPPrefixTrie.
+#
+# Copyright (C) 2025 Interstellio IO (PTY) LTD.
+#
+# IPPrefixTrie is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or any later version.
+
+# IPPrefixTrie is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with IPPrefixTrie. If not, see https://www.gnu.org/licenses/.
+from bisect import bisect_right
+from typing import Any
+from typing import Generator
+from typing import Iterable
+import ipaddress
+
+from .exceptions import InvalidPrefixError
+
+# Result index of address ranges not covered by any prefix.
+_NO_MATCH = -1
+
+
+def _build_intervals(prefixes: Iterable[tuple[int, int, Any]],
+                     max_prefixlen: int,
+                     network_class: type,
+                     results: list) -> tuple[list[int], list[int]]:
+    # Flattens nested prefixes into non-overlapping ranges, each range
+    # mapping to the result index of its longest matching prefix.
+    #
+    # Prefixes must be ordered by network address with shorter prefixes
+    # first, which is the pre-order of the trie.
+    starts = [0]
+    index = [_NO_MATCH]
+    covering = []  # Stack of (last address, result index) of parents.
+
+    def add_range(start, result_index):
+        if starts[-1] == start:
+            # Range starting here supersedes an empty range.
+            index[-1] = result_index
+            if len(index) > 1 and index[-2] == result_index:
+                starts.pop()
+                index.pop()
+        elif index[-1] != result_index:
+            starts.append(start)
+            index.append(result_index)
+
+    def close_ranges(before):
+        # Resume the parent prefix after each nested prefix ends.
+        while covering and covering[-1][0] < before:
+            last, _ = covering.pop()
+            if last + 1 < 1 << max_prefixlen:
+                add_range(last + 1,
+                          covering[-1][1] if covering else _NO_MATCH)
+
+    for network, prefix_len, metadata in prefixes:
+        close_ranges(network)
+        last = network | ((1 << (max_prefixlen - prefix_len)) - 1)
+        results.append((str(network_class((network, prefix_len))),
+                        metadata))
+        add_range(network, len(results) - 1)
+        covering.append((last, len(results) - 1))
+
+    close_ranges(1 << max_prefixlen)
+
+    return starts, index
+
+
+class IPIntervalTable(object):
+    """
+    A read-only flattened interval table compiled from an IPPrefixTrie.
+
+    Nested prefixes are resolved into non-overlapping address ranges per
+    address family, stored as a sorted list of range starts and a list
+    of result indexes. A longest prefix match is a single bisect.
+
+    Use `IPPrefixTrie.compile` to create one, later changes to the trie
+    are not reflected in the table.
+    """
+    __slots__ = ("__ipv4_starts", "__ipv4_index",
+                 "__ipv6_starts", "__ipv6_index",
+                 "__results")
+
+    def __init__(self,
+                 ipv4_prefixes: Iterable[tuple[int, int, Any]] = (),
+                 ipv6_prefixes: Iterable[tuple[int, int, Any]] = ()):
+        """Compiles the interval table.
+
+        Args:
+            ipv4_prefixes (Iterable): (network as int, prefix length,
+                metadata) ordered by network with shorter prefixes first.
+            ipv6_prefixes (Iterable): (network as int, prefix length,
+                metadata) ordered by network with shorter prefixes first.
+        """
+        self.__results = []
+        self.__ipv4_starts, self.__ipv4_index = _build_intervals(
+            ipv4_prefixes, 32, ipaddress.IPv4Network, self.__results)
+        self.__ipv6_starts, self.__ipv6_index = _build_intervals(
+            ipv6_prefixes, 128, ipaddress.IPv6Network, self.__results)
+
+    def __len__(self) -> int:
+        """Returns the number of address ranges in the table."""
+        return len(self.__ipv4_starts) + len(self.__ipv6_starts)
+
+    def get_longest(self, prefix: str) -> tuple[str, Any] | None:
+        """Finds the longest matching prefix.
+
+        Args:
+            prefix (str): The IPv4 or Ipv6 prefix in CIDR notation.
+
+        Raises:
+            InvalidPrefixError: If the prefix format is invalid.
+
+        Returns:
+            tuple[str, Any] | None: A tuple containing the prefix as a string
+            and its associated metadata if found, otherwise None.
+        """
+        try:
+            prefix = ipaddress.ip_network(prefix)
+        except ValueError as e:
+            raise InvalidPrefixError(str(e)) from None
+
+        if prefix.version == 4:
+            starts, index = self.__ipv4_starts, self.__ipv4_index
+        else:
+            starts, index = self.__ipv6_starts, self.__ipv6_index
+
+        result_index = index[bisect_right(
+            starts, int(prefix.network_address)) - 1]
+        if result_index == _NO_MATCH:
+            return None
+
+        return self.__results[result_index]
+
+    def get_longest_many(self, prefixes: Iterable[str]) -> Generator[
+            tuple[str, Any] | None, None, None]:
+        """Yields the longest matching prefix for each prefix given.
+
+        Ascending runs of addresses are resolved by walking the table
+        forward, so a sorted stream is matched in linear time. Addresses
+        out of order fall back to a bisect.
+
+        Args:
+            prefixes (Iterable[str]): IPv4 or Ipv6 prefixes in CIDR
+                notation.
+
+        Raises:
+            InvalidPrefixError: If a prefix format is invalid.
+
+        Yields:
+            tuple[str, Any] | None: The matching prefix as a string and
+            its associated metadata, None if there is no match.
+        """
+        families = {4: (self.__ipv4_starts, self.__ipv4_index),
+                    6: (self.__ipv6_starts, self.__ipv6_index)}
+        positions = {4: 0, 6: 0}
+
+        for prefix in prefixes:
+            try:
+                prefix = ipaddress.ip_network(prefix)
+            except ValueError as e:
+                raise InvalidPrefixError(str(e)) from None
+
+            starts, index = families[prefix.version]
+            address = int(prefix.network_address)
+            position = positions[prefix.version]
+
+            if address < starts[position]:
+                position = bisect_right(starts, address) - 1
+            else:
+                last_position = len(starts) - 1
+                while (position < last_position
+                        and starts[position + 1] <= address):
+                    position += 1
+            positions[prefix.version] = position
+
+            result_index = index[position]
+            if result_index == _NO_MATCH:
+                yield None
+            else:
+                yield self.__results[result_index]
@@ -16,12 +16,26 @@
 
 # You should have received a copy of the GNU Lesser General Public License
 # along with IPPrefixTrie. If not, see https://www.gnu.org/licenses/.
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
 from typing import Any
 from typing import Generator
+from typing import Iterable
 import ipaddress
 
 from .exceptions import (InvalidPrefixError,
-                         PrefixNotFoundError)
+                         PrefixNotFoundError,
+                         VersionError)
+from .intervaltable import IPIntervalTable
+from .profiler import (IPPrefixTrieProfiler,
+                       _profiled)
+
+# Default IPv6 split points, prefix lengths with a hashed table.
+IPV6_SPLITS = (16, 32, 48)
+
+# Hashed key ranges up to this size are probed instead of bisected.
+_PROBE_LIMIT = 16
 
 
 class _IPPrefixTrieNode(object):
@@ -42,41 +56,545 @@ class _IPPrefixTrieNode(object):
         self.is_prefix = False
         self.metadata = None
 
+    def copy(self) -> "_IPPrefixTrieNode":
+        """Returns a shallow copy sharing the child nodes."""
+        node = _IPPrefixTrieNode()
+        node.left = self.left
+        node.right = self.right
+        node.is_prefix = self.is_prefix
+        node.metadata = self.metadata
+        return node
+
+
+class _IPPrefixTrieFamily(object):
+    """
+    Internal layout for the prefixes of a single address family.
+
+    Prefixes shorter than the first split point are stored in a binary
+    trie below `root`. Each split point has a hash table keyed by the
+    leading split bits of the address, holding a binary subtrie for the
+    prefixes up to the next split point. Walks therefore start at the
+    hashed subtrie instead of descending bit by bit from the root.
+
+    Without split points the layout is a plain binary trie. A persistent
+    layout never modifies nodes in place, `insert` and `delete` copy the
+    nodes along the path and replace `root`, leaving the previous root
+    intact for snapshots sharing it.
+
+    Attributes:
+        root (_IPPrefixTrieNode): Root of the prefixes before the first
+            split point.
+        max_prefixlen (int): Number of bits in an address.
+        address_class (type): IPv4Address or IPv6Address.
+        splits (tuple[int, ...]): Ascending split points.
+        tables (tuple[dict[int, _IPPrefixTrieNode], ...]): Hash table of
+            subtries per split point.
+        keys (tuple[list[int], ...]): Sorted keys of each hash table.
+        persistent (bool): Copy nodes on the path instead of modifying.
+    """
+    __slots__ = ("root", "max_prefixlen", "address_class",
+                 "splits", "tables", "keys", "persistent")
+
+    def __init__(self, max_prefixlen: int, address_class: type,
+                 splits: Iterable[int] = (), persistent: bool = False):
+        splits = tuple(splits)
+        for previous, split in zip((0,) + splits, splits):
+            if not previous < split < max_prefixlen:
+                raise ValueError("split points must be ascending and"
+                                 f" between 1 and {max_prefixlen - 1}")
+        if splits and persistent:
+            # Copying a hash table is not bound by the path length.
+            raise ValueError("persistent layout does not support"
+                             " split points")
+
+        self.root = _IPPrefixTrieNode()
+        self.max_prefixlen = max_prefixlen
+        self.address_class = address_class
+        self.splits = splits
+        self.tables = tuple({} for _ in splits)
+        self.keys = tuple([] for _ in splits)
+        self.persistent = persistent
+
+    def copy(self) -> "_IPPrefixTrieFamily":
+        """Returns a copy sharing all nodes, only for persistent layouts."""
+        family = _IPPrefixTrieFamily.__new__(_IPPrefixTrieFamily)
+        family.root = self.root
+        family.max_prefixlen = self.max_prefixlen
+        family.address_class = self.address_class
+        family.splits = self.splits
+        family.tables = self.tables
+        family.keys = self.keys
+        family.persistent = self.persistent
+        return family
+
+    def __depth_limit(self, band: int) -> int:
+        # Deepest node depth stored within a band.
+        if band < len(self.splits):
+            return self.splits[band] - 1
+        return self.max_prefixlen
+
+    def __band_root(self, address: int, prefix_len: int,
+                    create: bool = False) -> tuple[int,
+                                                   _IPPrefixTrieNode | None,
+                                                   int]:
+        # Returns the band holding prefix_len, its root node and depth.
+        band = bisect_right(self.splits, prefix_len)
+        if band == 0:
+            return band, self.root, 0
+
+        split = self.splits[band - 1]
+        table = self.tables[band - 1]
+        key = address >> (self.max_prefixlen - split)
+        node = table.get(key)
+        if node is None and create:
+            node = table[key] = _IPPrefixTrieNode()
+            insort(self.keys[band - 1], key)
+
+        return band, node, split
+
+    def __path(self, address: int,
+               prefix_len: int) -> list[_IPPrefixTrieNode | None]:
+        # Nodes from the root down to prefix_len, None where missing.
+        shift = self.max_prefixlen - 1
+        node = self.root
+        path = [node]
+
+        for depth in range(prefix_len):
+            if node is not None:
+                if (address >> (shift - depth)) & 1:
+                    node = node.right
+                else:
+                    node = node.left
+            path.append(node)
+
+        return path
+
+    def __copy_path(self, address: int, path: list,
+                    node: _IPPrefixTrieNode | None) -> None:
+        # Replaces the last node on the path by node, copying every
+        # parent up to a new root. Parents left empty are dropped.
+        shift = self.max_prefixlen - 1
+
+        for depth in range(len(path) - 2, -1, -1):
+            parent = path[depth]
+            parent = parent.copy() if parent else _IPPrefixTrieNode()
+            if (address >> (shift - depth)) & 1:
+                parent.right = node
+            else:
+                parent.left = node
+
+            if (depth and not parent.is_prefix
+                    and not parent.left and not parent.right):
+                parent = None
+            node = parent
+
+        self.root = node or _IPPrefixTrieNode()
+
+    def insert(self, address: int, prefix_len: int, metadata: Any) -> None:
+        if self.persistent:
+            path = self.__path(address, prefix_len)
+            node = path[-1].copy() if path[-1] else _IPPrefixTrieNode()
+            node.is_prefix = True
+            node.metadata = metadata
+            self.__copy_path(address, path, node)
+            return
+
+        _, node, depth = self.__band_root(address, prefix_len, create=True)
+        shift = self.max_prefixlen - 1
+
+        for depth in range(depth, prefix_len):
+            if (address >> (shift - depth)) & 1:  # Insert Right child node.
+                if node.right is None:
+                    node.right = _IPPrefixTrieNode()
+                node = node.right
+            else:  # Insert Left child node.
+                if node.left is None:
+                    node.left = _IPPrefixTrieNode()
+                node = node.left
+
+        node.is_prefix = True
+        node.metadata = metadata
+
+    def find(self, address: int,
+             prefix_len: int) -> _IPPrefixTrieNode | None:
+        _, node, depth = self.__band_root(address, prefix_len)
+        shift = self.max_prefixlen - 1
 
-def _iterate_bits(data: bytes) -> Generator[tuple[int, int, bytes],
-                                            None, None]:
-    len_in_bytes = len(data)                  # Length of the data in bytes.
-    matched_bytes = bytearray(len_in_bytes)   # Ensure full-length padding.
+        for depth in range(depth, prefix_len):
+            if node is None:
+                break
+            if (address >> (shift - depth)) & 1:
+                node = node.right
+            else:
+                node = node.left
 
-    for bit_pos in range(len_in_bytes * 8):
-        byte_index = bit_pos // 8       # Get Byte
-        bit_index = 7 - (bit_pos % 8)   # Get Bit in Byte
-        bit = (data[byte_index] >> bit_index) & 1
+        return node
+
+    def covering(self, address: int,
+                 max_depth: int) -> list[tuple[int, _IPPrefixTrieNode]]:
+        # Single walk collecting every prefix node covering address up
+        # to max_depth bits, least specific first.
+        shift = self.max_prefixlen - 1
+        matches = []
+        node = self.root
+        depth = 0
+
+        for band in range(len(self.splits) + 1):
+            if band:
+                depth = self.splits[band - 1]
+                if depth > max_depth:
+                    break
+                node = self.tables[band - 1].get(
+                    address >> (self.max_prefixlen - depth))
+                if node is None:
+                    continue
+
+            if node.is_prefix:
+                matches.append((depth, node))
 
-        # Preserve the exact bytes for the matched prefix
-        matched_bytes[byte_index] |= (bit << bit_index)
+            for depth in range(depth, min(max_depth,
+                                          self.__depth_limit(band))):
+                if (address >> (shift - depth)) & 1:
+                    node = node.right
+                else:
+                    node = node.left
 
-        # Yielding bit position, actual bit and matched bytes thus far.
-        yield bit_pos, bit, bytes(matched_bytes)
+                if node is None:
+                    break
+
+                if node.is_prefix:
+                    matches.append((depth + 1, node))
+
+        return matches
+
+    def longest(self, address: int) -> tuple[int, _IPPrefixTrieNode] | None:
+        # Bands are probed from the deepest split point up, the first
+        # band holding a match has the longest match.
+        shift = self.max_prefixlen - 1
+
+        for band in range(len(self.splits), -1, -1):
+            if band:
+                depth = self.splits[band - 1]
+                node = self.tables[band - 1].get(
+                    address >> (self.max_prefixlen - depth))
+                if node is None:
+                    continue
+            else:
+                depth, node = 0, self.root
+
+            match = (depth, node) if node.is_prefix else None
+            for depth in range(depth, self.__depth_limit(band)):
+                if (address >> (shift - depth)) & 1:
+                    node = node.right
+                else:
+                    node = node.left
+
+                if node is None:
+                    break
+
+                if node.is_prefix:
+                    match = (depth + 1, node)
+
+            if match:
+                return match
+
+        return None
+
+    def __subtries(self, index: int, prefix_len: int,
+                   value: int) -> list[tuple[int, _IPPrefixTrieNode]]:
+        # Returns the (key, subtrie) hashed at split point index below
+        # the prefix, ordered by key. Only keys within the prefix are
+        # visited, never the whole table.
+        split = self.splits[index]
+        table = self.tables[index]
+        first = value << (split - prefix_len)
+        last = (value + 1) << (split - prefix_len)
+
+        if last - first <= _PROBE_LIMIT:
+            subtries = []
+            for key in range(first, last):
+                node = table.get(key)
+                if node is not None:
+                    subtries.append((key, node))
+            return subtries
+
+        keys = self.keys[index]
+        return [(key, table[key])
+                for key in keys[bisect_left(keys, first):
+                                bisect_left(keys, last)]]
+
+    def orlonger(self, address: int,
+                 prefix_len: int) -> Generator[tuple[str, Any], None, None]:
+        # Breadth first walk, level by level so the subtries hashed at a
+        # split point join the walk in order, shorter prefixes first.
+        band = bisect_right(self.splits, prefix_len)
+        node = self.find(address, prefix_len)
+        prefix_value = address >> (self.max_prefixlen - prefix_len)
+        level = [(prefix_value, node)] if node is not None else []
+        depth = prefix_len
+
+        for index in range(band, len(self.splits) + 1):
+            if index < len(self.splits):
+                split = self.splits[index]
+            else:
+                split = self.max_prefixlen + 1
+
+            while level and depth < split:
+                next_level = []
+                for value, node in level:
+                    if node.is_prefix:
+                        network = value << (self.max_prefixlen - depth)
+                        yield (f"{self.address_class(network)}/{depth}",
+                               node.metadata)
+
+                    if node.left:
+                        next_level.append((value << 1, node.left))
+                    if node.right:
+                        next_level.append(((value << 1) | 1, node.right))
+
+                level = next_level
+                depth += 1
+
+            if index < len(self.splits):
+                # Nodes within a band never reach the next split point.
+                level = self.__subtries(index, prefix_len, prefix_value)
+                depth = split
+
+    def delete(self, address: int, prefix_len: int) -> bool:
+        if self.persistent:
+            path = self.__path(address, prefix_len)
+            node = path[-1]
+            if node is None or not node.is_prefix:
+                return False  # Prefix not found
+
+            if node.left or node.right:
+                node = node.copy()
+                node.is_prefix = False
+                node.metadata = None
+            else:
+                node = None
+            self.__copy_path(address, path, node)
+            return True
+
+        band, node, depth = self.__band_root(address, prefix_len)
+        band_root = node
+        shift = self.max_prefixlen - 1
+        path_traversed = []  # Stores nodes visited along the path.
+
+        for depth in range(depth, prefix_len):
+            if node is None:
+                return False  # Prefix not found
+
+            # Store node reference and bit direction in traversed path.
+            bit = (address >> (shift - depth)) & 1
+            path_traversed.append((node, bit))
+            node = node.right if bit else node.left
+
+        if node is None or not node.is_prefix:
+            return False  # Prefix not found
+
+        # Unset the prefix flag and remove metadata
+        node.is_prefix = False
+        node.metadata = None
+
+        # Cleanup unnecessary nodes
+        while path_traversed:
+            parent, bit = path_traversed.pop()
+            if (bit == 0 and parent.left
+                    and not parent.left.is_prefix
+                    and not parent.left.left
+                    and not parent.left.right):
+                parent.left = None
+            elif (bit == 1 and parent.right
+                    and not parent.right.is_prefix
+                    and not parent.right.left
+                    and not parent.right.right):
+                parent.right = None
+            else:
+                break  # Stop cleanup if we hit a valid prefix
+
+        # Drop hashed subtries left empty.
+        if (band and not band_root.is_prefix
+                and not band_root.left and not band_root.right):
+            key = address >> (self.max_prefixlen - self.splits[band - 1])
+            keys = self.keys[band - 1]
+            del self.tables[band - 1][key]
+            del keys[bisect_left(keys, key)]
+
+        return True
+
+    def prefixes(self) -> list[tuple[int, int, Any]]:
+        # Returns (network as int, prefix length, metadata) ordered by
+        # network address with shorter prefixes first.
+        subtries = [(self.root, 0, 0)]
+        for split, table in zip(self.splits, self.tables):
+            subtries.extend((node, split, key) for key, node in table.items())
+
+        prefixes = []
+        for root, depth, value in subtries:
+            stack = [(root, depth, value)]
+            while stack:
+                node, depth, value = stack.pop()
+                if node.is_prefix:
+                    prefixes.append((value << (self.max_prefixlen - depth),
+                                     depth, node.metadata))
+                if node.right:
+                    stack.append((node.right, depth + 1, (value << 1) | 1))
+                if node.left:
+                    stack.append((node.left, depth + 1, value << 1))
+
+        if self.splits:
+            prefixes.sort(key=lambda prefix: prefix[:2])
+
+        return prefixes
+
+
+def _covering_result(prefix: ipaddress.IPv4Network | ipaddress.IPv6Network,
+                     depth: int,
+                     node: _IPPrefixTrieNode) -> tuple[str, Any]:
+    # Formats a node found covering prefix at depth as a result tuple.
+    host_bits = prefix.max_prefixlen - depth
+    network = (int(prefix.network_address) >> host_bits) << host_bits
+    return (f"{prefix.network_address.__class__(network)}/{depth}",
+            node.metadata)
 
 
 class IPPrefixTrie(object):
     """
     A binary trie for storing and searching IP prefixes efficiently.
-    """
-    __slots__ = ("__ipv4_root", "__ipv6_root")
 
-    def __init__(self):
-        self.clear()
+    IPv4 prefixes are stored in a plain binary trie. IPv6 prefixes use a
+    hybrid layout, with a hash table at each split point leading straight
+    to a compact binary subtrie, which keeps lookups from descending
+    through the sparsely populated leading bits.
+
+    A persistent trie never modifies nodes in place. Each `insert` and
+    `delete` copies only the nodes on the path to the prefix, so a
+    `snapshot` of any version is cheap and shares all unchanged nodes.
+    Versions are reclaimed once their snapshots are no longer referenced.
+
+    Args:
+        profiler (IPPrefixTrieProfiler, optional): Collects latency
+            histograms and prefix hit counters. Defaults to None.
+        ipv6_splits (Iterable[int], optional): Ascending IPv6 prefix
+            lengths with a hash table, an empty sequence uses a plain
+            binary trie. Defaults to (16, 32, 48), or a plain binary trie
+            if persistent.
+        persistent (bool, optional): If True, modifications create a new
+            version and `snapshot` is available. Defaults to False.
+
+    Raises:
+        ValueError: If the split points are not ascending, out of range
+            or given for a persistent trie.
+    """
+    __slots__ = ("__ipv4", "__ipv6", "__ipv6_splits", "__persistent",
+                 "__read_only", "__version", "_profiler")
+
+    def __init__(self, profiler: IPPrefixTrieProfiler | None = None,
+                 ipv6_splits: Iterable[int] | None = None,
+                 persistent: bool = False):
+        if ipv6_splits is None:
+            ipv6_splits = () if persistent else IPV6_SPLITS
+
+        self._profiler = profiler
+        self.__ipv6_splits = tuple(ipv6_splits)
+        self.__persistent = persistent
+        self.__read_only = False
+        self.__version = 0
+        self.__reset()
+
+    @property
+    def profiler(self) -> IPPrefixTrieProfiler | None:
+        """The attached profiler, None when profiling is disabled."""
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: IPPrefixTrieProfiler | None) -> None:
+        self._profiler = profiler
+
+    @property
+    def ipv6_splits(self) -> tuple[int, ...]:
+        """The IPv6 prefix lengths with a hash table."""
+        return self.__ipv6_splits
+
+    @property
+    def persistent(self) -> bool:
+        """True if modifications create a new version."""
+        return self.__persistent
+
+    @property
+    def read_only(self) -> bool:
+        """True for snapshots, which can not be modified."""
+        return self.__read_only
+
+    @property
+    def version(self) -> int:
+        """Number of modifications made since the trie was created."""
+        return self.__version
+
+    def __check_writable(self) -> None:
+        if self.__read_only:
+            raise VersionError(f"version {self.__version} is a read-only"
+                               " snapshot")
+
+    def __reset(self) -> None:
+        self.__ipv4 = _IPPrefixTrieFamily(32, ipaddress.IPv4Address,
+                                          persistent=self.__persistent)
+        self.__ipv6 = _IPPrefixTrieFamily(128, ipaddress.IPv6Address,
+                                          self.__ipv6_splits,
+                                          persistent=self.__persistent)
 
     def clear(self):
         """Initializes an IP prefix trie.
 
         Separate roots for IPv4 and IPv6 prefixes.
+
+        Raises:
+            VersionError: If the trie is a read-only snapshot.
+        """
+        self.__check_writable()
+        self.__reset()
+        self.__version += 1
+
+    def snapshot(self) -> "IPPrefixTrie":
+        """Returns a read-only snapshot of the current version.
+
+        The snapshot shares all nodes with the trie and supports the full
+        query API, later modifications to the trie are not reflected.
+
+        Raises:
+            VersionError: If the trie is not persistent.
+
+        Returns:
+            IPPrefixTrie: The read-only snapshot.
         """
-        self.__ipv4_root = _IPPrefixTrieNode()
-        self.__ipv6_root = _IPPrefixTrieNode()
+        if not self.__persistent:
+            raise VersionError("snapshots require a persistent trie")
+
+        snapshot = self.__class__.__new__(self.__class__)
+        snapshot._profiler = self._profiler
+        snapshot.__ipv6_splits = self.__ipv6_splits
+        snapshot.__persistent = True
+        snapshot.__read_only = True
+        snapshot.__version = self.__version
+        snapshot.__ipv4 = self.__ipv4.copy()
+        snapshot.__ipv6 = self.__ipv6.copy()
+        return snapshot
+
+    def compile(self) -> IPIntervalTable:
+        """Compiles the trie into a read-only interval table.
+
+        The table resolves longest prefix matches with a single bisect,
+        useful for read-mostly workloads. Later changes to the trie are
+        not reflected in the table.
 
+        Returns:
+            IPIntervalTable: The compiled interval table.
+        """
+        return IPIntervalTable(self.__ipv4.prefixes(),
+                               self.__ipv6.prefixes())
+
+    @_profiled()
     def insert(self, prefix: str, metadata=None) -> None:
         """Inserts an IP prefix into the trie.
 
@@ -87,34 +605,24 @@ class IPPrefixTrie(object):
 
         Raises:
             InvalidPrefixError: If the prefix format is invalid.
+            VersionError: If the trie is a read-only snapshot.
         """
         try:
             prefix = ipaddress.ip_network(prefix)
         except ValueError as e:
             raise InvalidPrefixError(str(e)) from None
 
-        prefix_len = prefix.prefixlen
-        prefix_bin = prefix.network_address.packed
         if prefix.version == 4:
-            node = self.__ipv4_root
+            family = self.__ipv4
         else:
-            node = self.__ipv6_root
+            family = self.__ipv6
 
-        for bit_pos, bit, matched_bytes in _iterate_bits(prefix_bin):
-            if bit_pos >= prefix_len:
-                break
-            if bit == 0:  # Insert Left child node.
-                if node.left is None:
-                    node.left = _IPPrefixTrieNode()
-                node = node.left
-            elif bit == 1:  # Insert Right child node.
-                if node.right is None:
-                    node.right = _IPPrefixTrieNode()
-                node = node.right
-
-        node.is_prefix = True
-        node.metadata = metadata or {}
+        self.__check_writable()
+        family.insert(int(prefix.network_address), prefix.prefixlen,
+                      metadata or {})
+        self.__version += 1
 
+    @_profiled(hits=True)
     def get_exact(self, prefix: str,
                   raise_error=True) -> tuple[str, Any] | None:
         """Retrieves an exact prefix match.
@@ -138,36 +646,28 @@ class IPPrefixTrie(object):
         except ValueError as e:
             raise InvalidPrefixError(str(e)) from None
 
-        prefix_len = prefix.prefixlen
-        prefix_bin = prefix.network_address.packed
         if prefix.version == 4:
-            node = self.__ipv4_root
+            family = self.__ipv4
         else:
-            node = self.__ipv6_root
-
-        # Iterate through each byte in the prefix
-        for bit_pos, bit, matched_bytes in _iterate_bits(prefix_bin):
-            if bit_pos >= prefix_len:
-                break
-
-            if bit == 0:  # Insert Left child node.
-                if node.left is None:
-                    if raise_error:
-                        raise PrefixNotFoundError(str(prefix))
-                    return
-                node = node.left
-            elif bit == 1:  # Insert Right child node.
-                if node.right is None:
-                    if raise_error:
-                        raise PrefixNotFoundError(str(prefix))
-                    return
-                node = node.right
+            family = self.__ipv6
 
+        node = family.find(int(prefix.network_address), prefix.prefixlen)
         if node and node.is_prefix:
             return str(prefix), node.metadata
         elif raise_error:
             raise PrefixNotFoundError(str(prefix))
 
+    def __get_covering(self, prefix: ipaddress.IPv4Network |
+                       ipaddress.IPv6Network,
+                       max_depth: int) -> list[tuple[int, _IPPrefixTrieNode]]:
+        if prefix.version == 4:
+            family = self.__ipv4
+        else:
+            family = self.__ipv6
+
+        return family.covering(int(prefix.network_address), max_depth)
+
+    @_profiled(hits=True)
     def get_longest(self, prefix: str,
                     raise_error=True) -> tuple[str, Any] | None:
         """Finds the longest matching prefix.
@@ -191,40 +691,21 @@ class IPPrefixTrie(object):
         except ValueError as e:
             raise InvalidPrefixError(str(e)) from None
 
-        prefix_bin = prefix.network_address.packed
-
         if prefix.version == 4:
-            node = self.__ipv4_root
+            family = self.__ipv4
         else:
-            node = self.__ipv6_root
+            family = self.__ipv6
 
-        longest_match_node = None
-        longest_match_length = 0
-
-        for bit_pos, bit, matched_bytes in _iterate_bits(prefix_bin):
-            if bit == 0:
-                if node.left is None:
-                    break
-                node = node.left
-            else:
-                if node.right is None:
-                    break
-                node = node.right
-
-            if node.is_prefix:
-                longest_match_node = node
-                longest_match_length = bit_pos + 1
-
-        if longest_match_node:
-            network_address = ipaddress.ip_address(bytes(matched_bytes))
-            prefix_str = f"{network_address}/{longest_match_length}"
-            return prefix_str, longest_match_node.metadata
+        match = family.longest(int(prefix.network_address))
+        if match:
+            return _covering_result(prefix, *match)
 
         return None
 
+    @_profiled(hits=True)
     def get_orlonger(self, prefix: str) -> Generator[tuple[str, Any],
                                                      None, None] | None:
-        """Yields orlonger prefixes.
+        """Yields orlonger prefixes, shorter prefixes first.
 
         Args:
             prefix (str): The IPv4 or Ipv6 prefix in CIDR notation.
@@ -240,52 +721,63 @@ class IPPrefixTrie(object):
         except ValueError as e:
             raise InvalidPrefixError(str(e)) from None
 
-        prefix_bin = prefix.network_address.packed
         if prefix.version == 4:
-            node = self.__ipv4_root
+            family = self.__ipv4
         else:
-            node = self.__ipv6_root
+            family = self.__ipv6
 
-        matched_bytes = bytearray(len(prefix_bin))
-        bit_pos = 0
+        yield from family.orlonger(int(prefix.network_address),
+                                   prefix.prefixlen)
 
-        # Step 1: Find the given prefix in the trie
-        for bit_pos, bit, matched_bytes in _iterate_bits(prefix_bin):
-            if bit_pos >= prefix.prefixlen:
-                break
+    @_profiled(hits=True)
+    def get_orshorter(self, prefix: str) -> list[tuple[str, Any]]:
+        """Finds all prefixes covering the given prefix.
 
-            if bit == 0:  # Insert Left child node.
-                if node.left is None:
-                    return
-                node = node.left
-            elif bit == 1:  # Insert Right child node.
-                if node.right is None:
-                    return
-                node = node.right
+        Args:
+            prefix (str): The IPv4 or Ipv6 prefix in CIDR notation.
 
-        # Step 2: Traverse tree to yield all and more specific (child) prefixes
-        queue = [(node, bit_pos, matched_bytes[:])]
-        while queue:
-            node, bit_pos, matched_prefix = queue.pop(0)
+        Raises:
+            InvalidPrefixError: If the prefix format is invalid.
 
-            if node.is_prefix:
-                network_address = ipaddress.ip_address(bytes(matched_prefix))
-                yield f"{network_address}/{bit_pos}", node.metadata
+        Returns:
+            list[tuple[str, Any]]: The prefix as a string and its associated
+            metadata for the given prefix and all shorter prefixes covering
+            it, ordered from least to most specific.
+        """
+        try:
+            prefix = ipaddress.ip_network(prefix)
+        except ValueError as e:
+            raise InvalidPrefixError(str(e)) from None
 
-            if bit_pos < prefix.max_prefixlen:
-                byte_index = bit_pos // 8
-                bit_index = 7 - (bit_pos % 8)
+        return [_covering_result(prefix, depth, node)
+                for depth, node in self.__get_covering(prefix,
+                                                       prefix.prefixlen)]
 
-                if node.left:
-                    left_prefix = bytearray(matched_prefix)
-                    left_prefix[byte_index] &= ~(1 << bit_index)
-                    queue.append((node.left, bit_pos + 1, left_prefix))
+    @_profiled(hits=True)
+    def get_all_matches(self, address: str) -> list[tuple[str, Any]]:
+        """Finds all prefixes matching an address.
 
-                if node.right:
-                    right_prefix = bytearray(matched_prefix)
-                    right_prefix[byte_index] |= (1 << bit_index)
-                    queue.append((node.right, bit_pos + 1, right_prefix))
+        Args:
+            address (str): The IPv4 or Ipv6 address.
+
+        Raises:
+            InvalidPrefixError: If the address format is invalid.
+
+        Returns:
+            list[tuple[str, Any]]: The prefix as a string and its associated
+            metadata for every prefix containing the address, ordered from
+            least to most specific. The last entry is the longest match.
+        """
+        try:
+            address = ipaddress.ip_network(address)
+        except ValueError as e:
+            raise InvalidPrefixError(str(e)) from None
+
+        return [_covering_result(address, depth, node)
+                for depth, node in self.__get_covering(address,
+                                                       address.max_prefixlen)]
 
+    @_profiled()
     def delete(self, prefix: str, raise_error=True) -> bool:
         """Deletes the given prefix from the trie.
 
@@ -301,6 +793,7 @@ class IPPrefixTrie(object):
             InvalidPrefixError: If the prefix format is invalid.
             PrefixNotFoundError: If the match is not found and
                 `raise_error` is True.
+            VersionError: If the trie is a read-only snapshot.
 
         Returns:
             bool: True if deleted, false is not found.
@@ -310,58 +803,17 @@ class IPPrefixTrie(object):
         except ValueError as e:
             raise InvalidPrefixError(str(e)) from None
 
-        prefix_bin = prefix.network_address.packed
         if prefix.version == 4:
-            node = self.__ipv4_root
+            family = self.__ipv4
         else:
-            node = self.__ipv6_root
+            family = self.__ipv6
 
-        path_traversed = []  # Stores nodes visited along the path.
-
-        for bit_pos, bit, matched_bytes in _iterate_bits(prefix_bin):
-            if bit_pos >= prefix.prefixlen:
-                break
-
-            # Store node reference and bit direction in traversed path.
-            path_traversed.append((node, bit))
-
-            if bit == 0:
-                if node.left is None:
-                    if raise_error:
-                        raise PrefixNotFoundError(str(prefix))
-                    return False  # Prefix not found
-                node = node.left
-            else:
-                if node.right is None:
-                    if raise_error:
-                        raise PrefixNotFoundError(str(prefix))
-                    return False  # Prefix not found
-                node = node.right
+        self.__check_writable()
+        if family.delete(int(prefix.network_address), prefix.prefixlen):
+            self.__version += 1
+            return True
 
-        if not node.is_prefix:
-            if raise_error:
-                raise PrefixNotFoundError(str(prefix))
-
-            return False  # Prefix not found
-
-        # Unset the prefix flag and remove metadata
-        node.is_prefix = False
-        node.metadata = None
-
-        # Cleanup unnecessary nodes
-        while path_traversed:
-            parent, bit = path_traversed.pop()
-            if (bit == 0 and parent.left
-                    and not parent.left.is_prefix
-                    and not parent.left.left
-                    and not parent.left.right):
-                parent.left = None
-            elif (bit == 1 and parent.right
-                    and not parent.right.is_prefix
-                    and not parent.right.left
-                    and not parent.right.right):
-                parent.right = None
-            else:
-                break  # Stop cleanup if we hit a valid prefix
+        if raise_error:
+            raise PrefixNotFoundError(str(prefix))
 
-        return True
+        return False  # Prefix not found
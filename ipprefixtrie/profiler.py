@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of IPPrefixTrie.
+#
+# Copyright (C) 2025 Interstellio IO (PTY) LTD.
+#
+# IPPrefixTrie is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or any later version.
+
+# IPPrefixTrie is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with IPPrefixTrie. If not, see https://www.gnu.org/licenses/.
+from collections import Counter
+from time import perf_counter_ns
+from typing import Any
+from typing import Callable
+import functools
+import inspect
+
+# Number of log2 latency buckets, covers up to 2**63 nanoseconds.
+_HISTOGRAM_BUCKETS = 64
+
+
+class LatencyHistogram(object):
+    """
+    Log2 bucketed latency histogram measured in nanoseconds.
+
+    Bucket ``n`` counts the samples within ``[2**(n-1), 2**n)``
+    nanoseconds, bucket 0 counts samples of 0 nanoseconds.
+
+    Attributes:
+        buckets (list[int]): Sample count per log2 bucket.
+        count (int): Total number of samples recorded.
+        total_ns (int): Sum of all samples in nanoseconds.
+        min_ns (int | None): Smallest sample recorded.
+        max_ns (int): Largest sample recorded.
+    """
+    __slots__ = ("buckets", "count", "total_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets = [0] * _HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        """Records a latency sample.
+
+        Args:
+            elapsed_ns (int): Latency of the sample in nanoseconds.
+        """
+        self.buckets[min(elapsed_ns.bit_length(),
+                         _HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile(self, percent: float) -> int:
+        """Estimates a latency percentile.
+
+        Args:
+            percent (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Upper bound in nanoseconds of the bucket containing the
+            percentile, 0 if no samples have been recorded.
+        """
+        if not self.count:
+            return 0
+
+        threshold = self.count * percent / 100
+        seen = 0
+        for bucket, samples in enumerate(self.buckets):
+            seen += samples
+            if samples and seen >= threshold:
+                return min((1 << bucket) - 1, self.max_ns)
+
+        return self.max_ns
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the histogram as a plain dictionary for exporting."""
+        return {"count": self.count,
+                "total_ns": self.total_ns,
+                "min_ns": self.min_ns,
+                "max_ns": self.max_ns,
+                "p50_ns": self.percentile(50),
+                "p99_ns": self.percentile(99),
+                "buckets": {(1 << bucket) - 1: samples
+                            for bucket, samples in enumerate(self.buckets)
+                            if samples}}
+
+
+class IPPrefixTrieProfiler(object):
+    """
+    Collects per-method latency histograms and sampled per-prefix hit
+    counters for an IPPrefixTrie.
+
+    Attach it with ``IPPrefixTrie(profiler=...)`` or by assigning
+    ``trie.profiler``. When no profiler is attached the trie only pays
+    for a single attribute check per call.
+
+    Attributes:
+        latency (dict[str, LatencyHistogram]): Histogram per method name.
+        hits (Counter): Sampled hit count per matched prefix.
+        hit_sample_interval (int): Every n-th prefix hit is counted.
+        export_hook (Callable | None): Called with the output of
+            `snapshot` when `export` is invoked.
+        export_interval (int): Calls `export` automatically after this
+            many profiled calls, 0 disables automatic exporting.
+    """
+    __slots__ = ("latency", "hits", "hit_sample_interval",
+                 "export_hook", "export_interval",
+                 "__hit_countdown", "__export_countdown")
+
+    def __init__(self, hit_sample_interval: int = 1,
+                 export_hook: Callable[[dict], None] | None = None,
+                 export_interval: int = 0):
+        if hit_sample_interval < 1:
+            raise ValueError("hit_sample_interval must be 1 or more")
+        if export_interval < 0:
+            raise ValueError("export_interval must be 0 or more")
+
+        self.hit_sample_interval = hit_sample_interval
+        self.export_hook = export_hook
+        self.export_interval = export_interval
+        self.reset()
+
+    def reset(self) -> None:
+        """Discards all collected latency samples and hit counters."""
+        self.latency = {}
+        self.hits = Counter()
+        self.__hit_countdown = self.hit_sample_interval
+        self.__export_countdown = self.export_interval
+
+    def record(self, method: str, elapsed_ns: int) -> None:
+        """Records the latency of a single call.
+
+        Args:
+            method (str): Name of the profiled method.
+            elapsed_ns (int): Latency of the call in nanoseconds.
+        """
+        try:
+            self.latency[method].record(elapsed_ns)
+        except KeyError:
+            histogram = self.latency[method] = LatencyHistogram()
+            histogram.record(elapsed_ns)
+
+        if self.export_interval:
+            self.__export_countdown -= 1
+            if self.__export_countdown <= 0:
+                self.__export_countdown = self.export_interval
+                self.export()
+
+    def hit(self, prefix: str) -> None:
+        """Counts a hit on a prefix, subject to `hit_sample_interval`.
+
+        Args:
+            prefix (str): The matched prefix in CIDR notation.
+        """
+        self.__hit_countdown -= 1
+        if self.__hit_countdown <= 0:
+            self.__hit_countdown = self.hit_sample_interval
+            self.hits[prefix] += 1
+
+    def top_hits(self, count: int | None = None) -> list[tuple[str, int]]:
+        """Returns the most frequently hit prefixes.
+
+        Args:
+            count (int, optional): Maximum number of prefixes to return.
+                Defaults to all prefixes.
+
+        Returns:
+            list[tuple[str, int]]: Prefix and sampled hit count, most hit
+            first. Useful to determine which prefixes to pre-warm.
+        """
+        return self.hits.most_common(count)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the collected counters as a plain dictionary."""
+        return {"latency": {method: histogram.as_dict()
+                            for method, histogram in self.latency.items()},
+                "hits": dict(self.hits),
+                "hit_sample_interval": self.hit_sample_interval}
+
+    def export(self) -> None:
+        """Passes a `snapshot` to the `export_hook` if one is set."""
+        if self.export_hook is not None:
+            self.export_hook(self.snapshot())
+
+
+def _profile_generator(profiler: IPPrefixTrieProfiler, name: str,
+                       generator, count_hits: bool):
+    # Only time spent inside the generator is measured, not the time
+    # the consumer spends between items.
+    elapsed_ns = 0
+    try:
+        while True:
+            start = perf_counter_ns()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                elapsed_ns += perf_counter_ns() - start
+            if count_hits:
+                profiler.hit(item[0])
+            yield item
+    finally:
+        generator.close()
+        profiler.record(name, elapsed_ns)
+
+
+def _profiled(hits: bool = False):
+    """Decorates an IPPrefixTrie method to report to its profiler.
+
+    Args:
+        hits (bool, optional): If True the matched prefixes returned or
+            yielded are counted as hits. Defaults to False.
+    """
+    def decorator(method):
+        name = method.__name__
+        is_generator = inspect.isgeneratorfunction(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self._profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+
+            if is_generator:
+                return _profile_generator(profiler, name,
+                                          method(self, *args, **kwargs),
+                                          hits)
+
+            start = perf_counter_ns()
+            try:
+                result = method(self, *args, **kwargs)
+            except BaseException:
+                profiler.record(name, perf_counter_ns() - start)
+                raise
+            elapsed_ns = perf_counter_ns() - start
+
+            # Count the hit before recording so an export triggered by
+            # the recording includes it.
+            if hits and isinstance(result, list):
+                for item in result:
+                    profiler.hit(item[0])
+            elif hits and result is not None:
+                profiler.hit(result[0])
+            profiler.record(name, elapsed_ns)
+
+            return result
+
+        return wrapper
+
+    return decorator
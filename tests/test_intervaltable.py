@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of IPPrefixTrie.
+#
+# Copyright (C) 2025 Interstellio IO (PTY) LTD.
+#
+# IPPrefixTrie is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or any later version.
+
+# IPPrefixTrie is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with IPPrefixTrie. If not, see https://www.gnu.org/licenses/.
+import ipaddress
+import random
+
+import pytest
+from ipprefixtrie import IPPrefixTrie, IPIntervalTable
+from ipprefixtrie.exceptions import InvalidPrefixError
+
+
+def _expected_longest(networks, address):
+    address = ipaddress.ip_address(address)
+    matches = [network for network in networks if address in network]
+    if not matches:
+        return None
+    return str(max(matches, key=lambda network: network.prefixlen))
+
+
+def test_compile_get_longest():
+    trie = IPPrefixTrie()
+    trie.insert("10.0.0.0/8", {"desc": "Large Private IPv4 range"})
+    trie.insert("10.1.0.0/16", {"desc": "Nested range"})
+    trie.insert("10.1.2.0/24", {"desc": "More specific range"})
+    trie.insert("10.255.0.0/16", {"desc": "Range ending with parent"})
+    trie.insert("2001:db8::/32", {"desc": "Documentation IPv6 range"})
+
+    table = trie.compile()
+    assert isinstance(table, IPIntervalTable)
+
+    assert table.get_longest("10.1.2.3") == (
+        "10.1.2.0/24", {"desc": "More specific range"})
+    assert table.get_longest("10.1.3.1") == (
+        "10.1.0.0/16", {"desc": "Nested range"})
+    assert table.get_longest("10.2.0.1") == (
+        "10.0.0.0/8", {"desc": "Large Private IPv4 range"})
+    assert table.get_longest("10.255.255.255") == (
+        "10.255.0.0/16", {"desc": "Range ending with parent"})
+    assert table.get_longest("11.0.0.0") is None
+    assert table.get_longest("9.255.255.255") is None
+    assert table.get_longest("2001:db8::1") == (
+        "2001:db8::/32", {"desc": "Documentation IPv6 range"})
+    assert table.get_longest("2001:db9::1") is None
+
+
+def test_compile_empty_and_default_route():
+    assert IPPrefixTrie().compile().get_longest("10.0.0.1") is None
+
+    trie = IPPrefixTrie()
+    trie.insert("0.0.0.0/0", {"desc": "Default route"})
+    trie.insert("255.255.255.255/32", {"desc": "Broadcast"})
+    table = trie.compile()
+
+    assert table.get_longest("1.2.3.4")[0] == "0.0.0.0/0"
+    assert table.get_longest("255.255.255.255")[0] == "255.255.255.255/32"
+    assert table.get_longest("::1") is None
+
+
+def test_compile_invalid_prefix():
+    with pytest.raises(InvalidPrefixError):
+        IPPrefixTrie().compile().get_longest("invalid_prefix")
+
+
+def test_compile_random_prefixes():
+    rng = random.Random(1234)
+    prefixes = set()
+    for _ in range(300):
+        prefix_len = rng.randint(4, 28)
+        address = rng.getrandbits(32) & (0xf0ffffff)
+        prefixes.add(str(ipaddress.ip_network((address, prefix_len),
+                                              strict=False)))
+
+    trie = IPPrefixTrie()
+    for prefix in prefixes:
+        trie.insert(prefix, prefix)
+    table = trie.compile()
+
+    addresses = [str(ipaddress.ip_address(rng.getrandbits(32)
+                                          & 0xf0ffffff))
+                 for _ in range(500)]
+    networks = [ipaddress.ip_network(prefix) for prefix in prefixes]
+    expected = [_expected_longest(networks, address)
+                for address in addresses]
+
+    for address, prefix in zip(addresses, expected):
+        result = table.get_longest(address)
+        assert (result and result[0]) == prefix
+
+    # Unsorted stream exercises the bisect fallback.
+    results = list(table.get_longest_many(addresses))
+    assert [result and result[0] for result in results] == expected
+
+    ordered = sorted(range(len(addresses)),
+                     key=lambda i: ipaddress.ip_address(addresses[i]))
+    results = list(table.get_longest_many(addresses[i] for i in ordered))
+    assert ([result and result[0] for result in results]
+            == [expected[i] for i in ordered])
+
+
+def test_get_longest_many_mixed_families():
+    trie = IPPrefixTrie()
+    trie.insert("192.168.0.0/16", {"desc": "Private IPv4 range"})
+    trie.insert("2001:db8::/32", {"desc": "Documentation IPv6 range"})
+    table = trie.compile()
+
+    results = list(table.get_longest_many(
+        ["192.168.1.1", "2001:db8::1", "192.169.0.1", "2001:db8:1::1"]))
+    assert [result and result[0] for result in results] == [
+        "192.168.0.0/16", "2001:db8::/32", None, "2001:db8::/32"]
@@ -16,10 +16,16 @@
 
 # You should have received a copy of the GNU Lesser General Public License
 # along with IPPrefixTrie. If not, see https://www.gnu.org/licenses/.
+import gc
+import ipaddress
+import random
+import weakref
+
 import pytest
 from ipprefixtrie import IPPrefixTrie
 from ipprefixtrie.exceptions import (InvalidPrefixError,
-                                     PrefixNotFoundError)
+                                     PrefixNotFoundError,
+                                     VersionError)
 
 
 def test_insert_and_get_exact():
@@ -105,3 +111,260 @@ def test_get_orlonger():
     results = list(trie.get_orlonger("2001:db8::/32"))
     assert len(results) == 1
     assert ("2001:db8::/32", {"desc": "IPv6 Documentation Range"}) in results
+
+
+def test_get_longest_network_address():
+    trie = IPPrefixTrie()
+
+    trie.insert("0.0.0.0/0", {"desc": "Default route"})
+    trie.insert("192.168.0.0/16", {"desc": "Larger Private IPv4 range"})
+    trie.insert("192.168.1.0/24", {"desc": "Private IPv4 range"})
+
+    assert trie.get_longest("192.168.1.200")[0] == "192.168.1.0/24"
+    assert trie.get_longest("192.168.2.1")[0] == "192.168.0.0/16"
+    assert trie.get_longest("10.0.0.1")[0] == "0.0.0.0/0"
+
+
+def test_get_orshorter():
+    trie = IPPrefixTrie()
+
+    trie.insert("10.0.0.0/8", {"desc": "Large Private IPv4 range"})
+    trie.insert("10.1.0.0/16", {"desc": "Nested range"})
+    trie.insert("10.1.2.0/24", {"desc": "More specific range"})
+    trie.insert("2001:db8::/32", {"desc": "Documentation IPv6 range"})
+
+    assert trie.get_orshorter("10.1.0.0/16") == [
+        ("10.0.0.0/8", {"desc": "Large Private IPv4 range"}),
+        ("10.1.0.0/16", {"desc": "Nested range"})]
+    assert trie.get_orshorter("10.1.2.128/25") == [
+        ("10.0.0.0/8", {"desc": "Large Private IPv4 range"}),
+        ("10.1.0.0/16", {"desc": "Nested range"}),
+        ("10.1.2.0/24", {"desc": "More specific range"})]
+    assert trie.get_orshorter("2001:db8:1::/48") == [
+        ("2001:db8::/32", {"desc": "Documentation IPv6 range"})]
+    assert trie.get_orshorter("11.0.0.0/8") == []
+
+    with pytest.raises(InvalidPrefixError):
+        trie.get_orshorter("invalid_prefix")
+
+
+def test_get_all_matches():
+    trie = IPPrefixTrie()
+
+    trie.insert("10.0.0.0/8", {"desc": "Large Private IPv4 range"})
+    trie.insert("10.1.2.0/24", {"desc": "More specific range"})
+    trie.insert("10.1.2.3/32", {"desc": "Host route"})
+
+    assert trie.get_all_matches("10.1.2.3") == [
+        ("10.0.0.0/8", {"desc": "Large Private IPv4 range"}),
+        ("10.1.2.0/24", {"desc": "More specific range"}),
+        ("10.1.2.3/32", {"desc": "Host route"})]
+    assert trie.get_all_matches("10.1.2.4") == [
+        ("10.0.0.0/8", {"desc": "Large Private IPv4 range"}),
+        ("10.1.2.0/24", {"desc": "More specific range"})]
+    assert trie.get_all_matches("192.168.1.1") == []
+
+
+def _random_ipv6_prefixes(rng, count):
+    prefixes = set()
+    for _ in range(count):
+        prefix_len = rng.choice((0, 3, 12, 16, 19, 24, 29, 32, 33,
+                                 40, 47, 48, 56, 64, 127, 128))
+        address = (0x2001 << 112) | rng.getrandbits(100)
+        if rng.random() < 0.5:
+            address = (0x2400 << 112) | rng.getrandbits(112)
+        prefixes.add(str(ipaddress.ip_network((address, prefix_len),
+                                              strict=False)))
+    return sorted(prefixes)
+
+
+@pytest.mark.parametrize("ipv6_splits", [(16, 32, 48), (32,), (8, 64)])
+def test_ipv6_splits_match_binary_layout(ipv6_splits):
+    rng = random.Random(4321)
+    prefixes = _random_ipv6_prefixes(rng, 400)
+    lookups = [str(ipaddress.ip_network(prefix).network_address
+                   + rng.getrandbits(16))
+               for prefix in rng.sample(prefixes, 100)]
+
+    binary = IPPrefixTrie(ipv6_splits=())
+    hybrid = IPPrefixTrie(ipv6_splits=ipv6_splits)
+    assert hybrid.ipv6_splits == ipv6_splits
+    for prefix in prefixes:
+        binary.insert(prefix, prefix)
+        hybrid.insert(prefix, prefix)
+
+    for prefix in prefixes:
+        assert hybrid.get_exact(prefix) == (prefix, prefix)
+        assert hybrid.get_orshorter(prefix) == binary.get_orshorter(prefix)
+        assert (list(hybrid.get_orlonger(prefix))
+                == list(binary.get_orlonger(prefix)))
+
+    for address in lookups:
+        assert hybrid.get_longest(address) == binary.get_longest(address)
+        assert (hybrid.get_all_matches(address)
+                == binary.get_all_matches(address))
+
+    assert (list(hybrid.get_orlonger("::/0"))
+            == list(binary.get_orlonger("::/0")))
+    assert (list(hybrid.compile().get_longest_many(sorted(lookups)))
+            == list(binary.compile().get_longest_many(sorted(lookups))))
+
+    for prefix in prefixes[::2]:
+        assert hybrid.delete(prefix) is True
+        assert hybrid.delete(prefix, raise_error=False) is False
+        binary.delete(prefix)
+
+    assert (list(hybrid.get_orlonger("::/0"))
+            == list(binary.get_orlonger("::/0")))
+    for address in lookups:
+        assert (hybrid.get_all_matches(address)
+                == binary.get_all_matches(address))
+
+
+def test_ipv6_get_orlonger_shortest_first():
+    trie = IPPrefixTrie()
+    for prefix in ("2001:db8::/40", "2001:db9::/32", "2001:db8::/33",
+                   "2001:db8::/32", "2001::/16"):
+        trie.insert(prefix)
+
+    assert [prefix for prefix, _ in trie.get_orlonger("2001::/16")] == [
+        "2001::/16", "2001:db8::/32", "2001:db9::/32", "2001:db8::/33",
+        "2001:db8::/40"]
+    assert [prefix for prefix, _ in trie.get_orlonger("2001:db8::/31")] == [
+        "2001:db8::/32", "2001:db9::/32", "2001:db8::/33", "2001:db8::/40"]
+
+
+class _NoScanDict(dict):
+    def __iter__(self):
+        raise AssertionError("hash table scanned")
+
+    keys = values = items = __iter__
+
+
+@pytest.mark.parametrize("prefix", ["2001:1234:5600::/40", "2001::/16",
+                                    "2001:1234:5678::/46"])
+def test_ipv6_get_orlonger_no_table_scan(prefix):
+    rng = random.Random(8765)
+    trie = IPPrefixTrie()
+    binary = IPPrefixTrie(ipv6_splits=())
+    prefixes = ["2001:1234:5600::/40", "2001:1234:5678::/48",
+                "2001:1234:5678:9a00::/56"]
+    prefixes += [str(ipaddress.ip_network(
+        ((0x2001 << 112) | rng.getrandbits(112), rng.randint(33, 56)),
+        strict=False)) for _ in range(500)]
+    for inserted in prefixes:
+        trie.insert(inserted)
+        binary.insert(inserted)
+
+    family = trie._IPPrefixTrie__ipv6
+    family.tables = tuple(_NoScanDict(table) for table in family.tables)
+
+    assert list(trie.get_orlonger(prefix)) == list(
+        binary.get_orlonger(prefix))
+
+
+def test_ipv6_splits_invalid():
+    with pytest.raises(ValueError):
+        IPPrefixTrie(ipv6_splits=(32, 16))
+
+    with pytest.raises(ValueError):
+        IPPrefixTrie(ipv6_splits=(128,))
+
+
+def test_persistent_snapshots():
+    trie = IPPrefixTrie(persistent=True)
+    assert trie.persistent is True
+    assert trie.ipv6_splits == ()
+
+    trie.insert("10.0.0.0/8", {"desc": "Large Private IPv4 range"})
+    before = trie.snapshot()
+
+    trie.insert("10.1.0.0/16", {"desc": "Nested range"})
+    trie.insert("2001:db8::/32", {"desc": "Documentation IPv6 range"})
+    trie.delete("10.0.0.0/8")
+    after = trie.snapshot()
+    trie.clear()
+
+    assert before.version == 1
+    assert after.version == 4
+    assert trie.version == 5
+
+    assert before.get_longest("10.1.2.3") == (
+        "10.0.0.0/8", {"desc": "Large Private IPv4 range"})
+    assert before.get_longest("2001:db8::1") is None
+    assert after.get_longest("10.1.2.3") == (
+        "10.1.0.0/16", {"desc": "Nested range"})
+    assert after.get_longest("10.2.0.1") is None
+    assert after.get_exact("2001:db8::/32") == (
+        "2001:db8::/32", {"desc": "Documentation IPv6 range"})
+    assert trie.get_longest("10.1.2.3") is None
+
+
+def test_persistent_random_history():
+    rng = random.Random(5678)
+    trie = IPPrefixTrie(persistent=True)
+    history = []
+    current = {}
+
+    for _ in range(300):
+        prefix = str(ipaddress.ip_network(
+            (rng.getrandbits(8) << 24, rng.randint(0, 12)), strict=False))
+        if prefix in current and rng.random() < 0.5:
+            assert trie.delete(prefix) is True
+            del current[prefix]
+        else:
+            trie.insert(prefix, {"version": trie.version})
+            current[prefix] = {"version": trie.version - 1}
+        history.append((trie.snapshot(), dict(current)))
+
+    for snapshot, expected in history:
+        assert sorted(snapshot.get_orlonger("0.0.0.0/0")) == sorted(
+            expected.items())
+        assert snapshot.compile().get_longest("10.1.2.3") == (
+            snapshot.get_longest("10.1.2.3"))
+
+
+def test_persistent_versions_reclaimed():
+    class _Marker:
+        pass
+
+    marker = _Marker()
+    trie = IPPrefixTrie(persistent=True)
+    trie.insert("10.0.0.0/8", marker)
+    snapshot = trie.snapshot()
+    trie.insert("10.1.0.0/16")
+    trie.delete("10.0.0.0/8")
+
+    reference = weakref.ref(marker)
+    del marker
+    gc.collect()
+    assert reference() is not None
+    assert snapshot.get_exact("10.0.0.0/8")[1] is reference()
+
+    del snapshot
+    gc.collect()
+    assert reference() is None
+    assert trie.get_exact("10.1.0.0/16") == ("10.1.0.0/16", {})
+
+
+def test_persistent_read_only_snapshot():
+    trie = IPPrefixTrie(persistent=True)
+    trie.insert("10.0.0.0/8")
+    snapshot = trie.snapshot()
+
+    assert snapshot.read_only is True
+    with pytest.raises(VersionError):
+        snapshot.insert("192.168.0.0/16")
+    with pytest.raises(VersionError):
+        snapshot.delete("10.0.0.0/8")
+    with pytest.raises(VersionError):
+        snapshot.clear()
+    assert snapshot.get_exact("10.0.0.0/8") == ("10.0.0.0/8", {})
+
+
+def test_persistent_invalid():
+    with pytest.raises(VersionError):
+        IPPrefixTrie().snapshot()
+
+    with pytest.raises(ValueError):
+        IPPrefixTrie(ipv6_splits=(32,), persistent=True)
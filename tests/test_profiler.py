@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of IPPrefixTrie.
+#
+# Copyright (C) 2025 Interstellio IO (PTY) LTD.
+#
+# IPPrefixTrie is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or any later version.
+
+# IPPrefixTrie is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with IPPrefixTrie. If not, see https://www.gnu.org/licenses/.
+import pytest
+from ipprefixtrie import IPPrefixTrie, IPPrefixTrieProfiler
+from ipprefixtrie.exceptions import PrefixNotFoundError
+from ipprefixtrie.profiler import LatencyHistogram
+
+
+def test_profiler_latency_and_hits():
+    profiler = IPPrefixTrieProfiler()
+    trie = IPPrefixTrie(profiler=profiler)
+
+    trie.insert("192.168.1.0/24", {"desc": "Private IPv4 range"})
+    trie.insert("192.168.1.128/25")
+    trie.get_exact("192.168.1.0/24")
+    trie.get_longest("192.168.1.10")
+    trie.get_longest("10.0.0.1")
+    assert len(list(trie.get_orlonger("192.168.1.0/24"))) == 2
+    trie.delete("192.168.1.128/25")
+
+    assert profiler.latency["insert"].count == 2
+    assert profiler.latency["get_exact"].count == 1
+    assert profiler.latency["get_longest"].count == 2
+    assert profiler.latency["get_orlonger"].count == 1
+    assert profiler.latency["delete"].count == 1
+    assert profiler.top_hits(1) == [("192.168.1.0/24", 3)]
+    assert profiler.hits["192.168.1.128/25"] == 1
+
+
+def test_profiler_counts_covering_hits():
+    profiler = IPPrefixTrieProfiler()
+    trie = IPPrefixTrie(profiler=profiler)
+    trie.insert("10.0.0.0/8")
+    trie.insert("10.1.0.0/16")
+
+    assert len(trie.get_all_matches("10.1.2.3")) == 2
+    assert len(trie.get_orshorter("10.0.0.0/16")) == 1
+
+    assert profiler.hits == {"10.0.0.0/8": 2, "10.1.0.0/16": 1}
+    assert profiler.latency["get_all_matches"].count == 1
+    assert profiler.latency["get_orshorter"].count == 1
+
+
+def test_profiler_records_failed_calls():
+    profiler = IPPrefixTrieProfiler()
+    trie = IPPrefixTrie(profiler=profiler)
+
+    with pytest.raises(PrefixNotFoundError):
+        trie.get_exact("10.0.0.0/8")
+
+    assert profiler.latency["get_exact"].count == 1
+    assert not profiler.hits
+
+
+def test_profiler_hit_sampling():
+    profiler = IPPrefixTrieProfiler(hit_sample_interval=3)
+    trie = IPPrefixTrie(profiler=profiler)
+    trie.insert("10.0.0.0/8")
+
+    for _ in range(9):
+        trie.get_longest("10.1.2.3")
+
+    assert profiler.hits["10.0.0.0/8"] == 3
+    assert profiler.latency["get_longest"].count == 9
+
+
+def test_profiler_export_hook():
+    exported = []
+    profiler = IPPrefixTrieProfiler(export_hook=exported.append,
+                                    export_interval=2)
+    trie = IPPrefixTrie(profiler=profiler)
+
+    trie.insert("10.0.0.0/8")
+    trie.get_exact("10.0.0.0/8")
+    trie.get_exact("10.0.0.0/8")
+
+    assert len(exported) == 1
+    assert exported[0]["hits"] == {"10.0.0.0/8": 1}
+    assert exported[0]["latency"]["insert"]["count"] == 1
+
+    profiler.export()
+    assert exported[1]["hits"] == {"10.0.0.0/8": 2}
+
+
+def test_profiler_detach():
+    profiler = IPPrefixTrieProfiler()
+    trie = IPPrefixTrie(profiler=profiler)
+    trie.profiler = None
+
+    trie.insert("10.0.0.0/8")
+    assert trie.profiler is None
+    assert not profiler.latency
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for elapsed_ns in (0, 1, 100, 100, 5000):
+        histogram.record(elapsed_ns)
+
+    assert histogram.count == 5
+    assert histogram.min_ns == 0
+    assert histogram.max_ns == 5000
+    assert histogram.percentile(50) == 127
+    assert histogram.percentile(100) == 5000
+    assert LatencyHistogram().percentile(99) == 0